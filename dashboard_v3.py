@@ -2,9 +2,18 @@
 import streamlit as st
 import yfinance as yf
 import pandas as pd
+import numpy as np
+import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 from datetime import datetime
 import urllib.error
+import os
+import time
+import concurrent.futures
+import threading
+from collections import OrderedDict
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # --- [v15] FRED API 라이브러리 임포트 ---
 try:
@@ -16,6 +25,11 @@ except ImportError:
 # --- [v18] 날짜 계산을 위한 pandas DateOffset 임포트 ---
 from pandas.tseries.offsets import DateOffset
 
+# --- [v26] pandas Copy-on-Write 활성화 (rename/dropna/슬라이스 시 불필요한 방어적 복사 제거) ---
+# pandas 3.x부터는 항상 켜져 있고 옵션이 deprecated 되었으므로 2.x에서만 설정합니다.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
 # --- 페이지 설정 ---
 st.set_page_config(
     page_title="글로벌 매크로 및 국내 증시 대시보드",
@@ -58,26 +72,32 @@ FRED_TICKERS = {
     'SOFR': 'SOFR'               # [v22] SOFR 지수 추가
 }
 
+# --- [v26] 로더 실패는 예외로 전달 (빈 결과가 디스크 캐시에 저장되지 않도록) ---
+class DataLoadError(Exception):
+    pass
+
 # --- [v15] YFinance 데이터 로더 (캐시) ---
-@st.cache_data(ttl=3600) # 1시간 캐시
-def load_yfinance_data(tickers_map, start_date="2010-01-01"):
+# [v26] 디스크에 영구 캐시 (서버 재시작 후에도 유지). persist="disk"는 ttl을 지원하지 않으므로
+# as_of(기준 시각, 1시간 단위)를 캐시 키에 포함시켜 기존 ttl=3600과 같은 주기로 갱신합니다.
+@st.cache_data(persist="disk", max_entries=4)
+def load_yfinance_data(tickers_map, start_date="2010-01-01", as_of=None):
     st.info(f"YFinance 데이터 다운로드 시도 (시작일: {start_date}): {list(tickers_map.values())}")
     try:
-        data = yf.download(list(tickers_map.values()), start=start_date)
+        # [v26] auto_adjust=True로 'Close'가 수정 종가가 되므로 'Adj Close' 컬럼을 따로 받지 않음
+        data = yf.download(
+            list(tickers_map.values()), start=start_date,
+            progress=False, threads=True, auto_adjust=True, actions=False, group_by='column'
+        )
         if data.empty:
             st.error("YFinance: 데이터가 비어있습니다.")
-            return pd.DataFrame(), pd.DataFrame()
+            raise DataLoadError("YFinance: empty download")
 
-        # 가격 데이터 추출 (Adj Close 우선, 없으면 Close)
-        if 'Adj Close' in data.columns:
-            prices_data = data['Adj Close']
-            st.info("YFinance: 'Adj Close' (수정 종가) 데이터를 우선 사용합니다.")
-        elif 'Close' in data.columns:
+        # 가격 데이터 추출 (수정 종가)
+        if 'Close' in data.columns:
             prices_data = data['Close']
-            st.info("YFinance: 'Close' (종가) 데이터를 사용합니다.")
         else:
             st.warning("YFinance: 가격 데이터를 찾을 수 없습니다.")
-            return pd.DataFrame(), pd.DataFrame()
+            raise DataLoadError("YFinance: no price column")
 
         # 거래량 데이터 추출
         if 'Volume' not in data.columns:
@@ -85,12 +105,11 @@ def load_yfinance_data(tickers_map, start_date="2010-01-01"):
         else:
             volume_data = data['Volume']
 
-        # 컬럼 이름 변경
-        downloaded_cols = prices_data.columns
-        rename_map = {v: k for k, v in tickers_map.items() if v in downloaded_cols}
-        
-        adj_close = prices_data.rename(columns=rename_map)
-        volume = volume_data.rename(columns=rename_map)
+        # 컬럼 이름 변경 ([v26] 티커 -> 이름 역매핑을 한 번만 만들고 reindex로 정렬)
+        inv_map = {v: k for k, v in tickers_map.items()}
+        adj_close = prices_data.rename(columns=inv_map)
+        valid_cols = [col for col in tickers_map if col in adj_close.columns]
+        volume = volume_data.rename(columns=inv_map).reindex(columns=valid_cols).dropna(axis=1, how='all')
         
         # 시간대 정보 제거
         try:
@@ -98,97 +117,452 @@ def load_yfinance_data(tickers_map, start_date="2010-01-01"):
             volume.index = volume.index.tz_localize(None)
         except TypeError: pass # 이미 naive
 
-        valid_cols = list(rename_map.values())
-        valid_volume_cols = [col for col in valid_cols if col in volume.columns]
-        
-        return adj_close[valid_cols], volume[valid_volume_cols]
+        # [v26] float32로 축소 (가격/거래량 모두 유효숫자 몇 자리면 충분, 메모리 절반)
+        adj_close = adj_close[valid_cols].astype('float32')
+        volume = volume.astype('float32')
+        return adj_close, volume
 
+    except DataLoadError:
+        raise
     except Exception as e:
         st.error(f"YFinance 데이터 로드 중 오류: {e}")
-        return pd.DataFrame(), pd.DataFrame()
+        raise DataLoadError("YFinance") from e
 
-# --- [v15] FRED API 데이터 로더 (캐시) ---
-@st.cache_data(ttl=3600) # 1시간 캐시
-def load_fred_data(tickers_map, start_date="2010-01-01"): 
+# --- [v26] FRED 클라이언트는 직렬화 대상이 아니므로 cache_resource로 공유 ---
+@st.cache_resource
+def _get_fred_client():
     # [v21] st.secrets에서 키 가져오기
     api_key = st.secrets.get("FRED_API_KEY")
+    return Fred(api_key=api_key) if api_key else None
+
+# --- [v15] FRED API 데이터 로더 (캐시) ---
+@st.cache_data(persist="disk", max_entries=4) # [v26] 디스크 캐시 (1시간 단위 갱신)
+def load_fred_data(tickers_map, start_date="2010-01-01", as_of=None): 
+    fred = _get_fred_client()
     
-    if not api_key:
+    if fred is None:
         st.warning("FRED API 키가 설정되지 않았습니다. `DFF`, `T10YIE`, `SOFR` 데이터는 생략됩니다.")
         st.info("로컬 실행 시 .streamlit/secrets.toml 파일을, 클라우드 배포 시 Secrets 설정을 확인하세요.")
-        return pd.DataFrame()
+        raise DataLoadError("FRED: missing API key")
     
     st.info(f"FRED API 데이터 다운로드 시도 (시작일: {start_date}): {list(tickers_map.values())}")
     
     try:
-        fred = Fred(api_key=api_key)
         all_series = []
         
-        for name, ticker in tickers_map.items():
-            try:
-                series = fred.get_series(ticker, start_date=start_date)
-                all_series.append(series.rename(name))
-            except ValueError as ve:
-                st.warning(f"FRED: '{ticker}' ({name}) 데이터를 찾을 수 없습니다. {ve}")
-            except Exception as e:
-                st.warning(f"FRED: '{ticker}' ({name}) 로드 중 오류: {e}")
+        # --- [v26] 시리즈별 요청을 병렬로 전송 ---
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(4, len(tickers_map))) as ex:
+            futures = {
+                ex.submit(fred.get_series, ticker, start_date=start_date): (name, ticker)
+                for name, ticker in tickers_map.items()
+            }
+            for future in concurrent.futures.as_completed(futures):
+                name, ticker = futures[future]
+                try:
+                    series = future.result()
+                    all_series.append(series.rename(name))
+                except ValueError as ve:
+                    st.warning(f"FRED: '{ticker}' ({name}) 데이터를 찾을 수 없습니다. {ve}")
+                except Exception as e:
+                    st.warning(f"FRED: '{ticker}' ({name}) 로드 중 오류: {e}")
+        # --- [v26] 끝 ---
 
         if not all_series:
             st.error("FRED: 모든 티커 로드에 실패했습니다.")
-            return pd.DataFrame()
+            raise DataLoadError("FRED: all series failed")
             
         df_fred = pd.concat(all_series, axis=1)
+        # 완료 순서와 무관하게 tickers_map 순서로 컬럼 정렬
+        df_fred = df_fred[[name for name in tickers_map if name in df_fred.columns]]
         
         try:
             df_fred.index = df_fred.index.tz_localize(None)
         except TypeError: pass 
             
         st.success("FRED API 데이터 로드 성공.")
-        return df_fred
+        return df_fred.astype('float32') # [v26] float32로 축소
 
+    except DataLoadError:
+        raise
     except urllib.error.HTTPError as e:
         if "400" in str(e):
             st.error("FRED API 키가 유효하지 않습니다. Streamlit Secrets 설정을 확인하세요.")
         else:
             st.error(f"FRED API 연결 오류: {e}")
-        return pd.DataFrame()
+        raise DataLoadError("FRED") from e
     except Exception as e:
         st.error(f"FRED API 로드 중 치명적 오류: {e}")
-        return pd.DataFrame()
+        raise DataLoadError("FRED") from e
+
+# --- [v26] 기간 필터링 및 Z-Score 계산 캐시 ---
+# 위젯 조작마다 전체 DataFrame을 해싱하지 않도록 DataFrame 인자(_df)는 캐시 키에서 제외하고,
+# 로드된 데이터셋을 식별하는 data_version과 기간/컬럼 등 명시적인 인자로 캐시 키를 만듭니다.
+@st.cache_data(ttl=3600)
+def slice_period(_df, data_version, name, start_ts, end_ts, ffill=False):
+    # 정렬된 DatetimeIndex에 대한 .loc 범위 슬라이스 (이진 탐색)
+    sliced = _df.loc[start_ts:end_ts]
+    if ffill:
+        # [v26] 전체 기간이 아닌 선택된 구간에만 ffill 적용
+        sliced = sliced.ffill()
+    return sliced.dropna(how='all')
+
+@st.cache_data(ttl=3600)
+def zscore(_df, data_version, start_ts, end_ts, columns):
+    # [v26] NumPy 배열에서 직접 계산 (pandas와 동일하게 NaN 무시, 표본표준편차 ddof=1)
+    arr = _df.to_numpy()
+    z = (arr - np.nanmean(arr, axis=0)) / np.nanstd(arr, axis=0, ddof=1)
+    return pd.DataFrame(z, index=_df.index, columns=_df.columns)
+
+@st.cache_data(ttl=3600)
+def yield_spread(_df, data_version, start_ts, end_ts):
+    # 장단기 금리차 (10Y - 3M), 두 금리가 모두 있는 날짜만 사용
+    spread_df = _df[['US_10Y_Yield', 'US_3M_Yield']].dropna()
+    return spread_df['US_10Y_Yield'] - spread_df['US_3M_Yield']
+
+@st.cache_data(ttl=3600)
+def nan_report(_df, data_version):
+    # 전체 기간이 NaN인 컬럼 (위젯 상태와 무관하므로 캐시)
+    counts = _df.isna().sum()
+    return counts[counts == len(_df)]
+
+# --- [v26] 긴 기간 라인 차트 서버측 다운샘플링 (LTTB) ---
+# "전체" 기간은 트레이스당 약 6,000 포인트이므로, 모양을 유지하면서 브라우저로 보내는 포인트 수를 줄입니다.
+MAX_LINE_POINTS = 1500
+
+def downsample(series, max_points=MAX_LINE_POINTS):
+    # Largest-Triangle-Three-Buckets: 구간마다 이전 선택점/다음 구간 평균과 만드는 삼각형 넓이가 최대인 점을 선택
+    series = series.dropna()
+    n = len(series)
+    if n <= max_points:
+        return series
+
+    x = series.index.asi8.astype('float64')
+    y = series.to_numpy(dtype='float64')
+    bucket = (n - 2) / (max_points - 2)
+
+    picked = np.empty(max_points, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(max_points - 2):
+        start = int(i * bucket) + 1
+        end = int((i + 1) * bucket) + 1
+        next_end = min(int((i + 2) * bucket) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        picked[i + 1] = a
+    return series.iloc[picked]
+
+# --- [v26] 금리 + 장단기 금리차 차트 (2행 서브플롯, 캐시) ---
+@st.cache_data(ttl=3600)
+def build_yield_fig(_df, data_version, start_ts, end_ts):
+    # 10Y, 3M 금리가 모두 있어 금리차를 그릴 수 있을 때만 2행 레이아웃 사용
+    spread = None
+    if 'US_10Y_Yield' in _df.columns and 'US_3M_Yield' in _df.columns:
+        spread = yield_spread(_df, data_version, start_ts, end_ts)
+    has_spread = spread is not None and not spread.empty
+
+    if has_spread:
+        fig = make_subplots(
+            rows=2, cols=1, shared_xaxes=True, row_heights=[0.6, 0.4],
+            vertical_spacing=0.08, subplot_titles=("", "장단기 금리차 (10Y - 3M)")
+        )
+    else:
+        fig = make_subplots(rows=1, cols=1)
+
+    if 'Fed_Funds' in _df.columns:
+        points = downsample(_df['Fed_Funds'])
+        fig.add_trace(go.Scatter(
+            x=points.index, y=points, 
+            name='연준 실효 금리 (DFF)', line=dict(color='red', dash='dot')
+        ), row=1, col=1)
+    # --- [v22] SOFR 차트 추가 ---
+    if 'SOFR' in _df.columns:
+        points = downsample(_df['SOFR'])
+        fig.add_trace(go.Scatter(
+            x=points.index, y=points, 
+            name='SOFR (단기 기준금리)', line=dict(color='green', dash='dot')
+        ), row=1, col=1)
+    # --- [v22] 끝 ---
+    if 'US_10Y_Yield' in _df.columns:
+        points = downsample(_df['US_10Y_Yield'])
+        fig.add_trace(go.Scatter(
+            x=points.index, y=points, 
+            name='미 10년물 금리 (%)', line=dict(color='blue')
+        ), row=1, col=1)
+    if 'US_3M_Yield' in _df.columns:
+        points = downsample(_df['US_3M_Yield'])
+        fig.add_trace(go.Scatter(
+            x=points.index, y=points, 
+            name='미 3개월물 금리 (%)', line=dict(color='orange')
+        ), row=1, col=1)
+
+    if has_spread:
+        points = downsample(spread)
+        fig.add_trace(go.Scatter(
+            x=points.index, y=points, 
+            name='10Y-3M Spread', line=dict(color='red'), fill='tozeroy'
+        ), row=2, col=1)
+        fig.add_hline(y=0, line_dash="dash", line_color="grey", row=2, col=1)
+        fig.update_layout(height=750)
+
+    fig.update_yaxes(title_text="금리 (%)", row=1, col=1)
+    fig.update_layout(
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
+# --- [v26] 차트 Figure 빌더 ---
+def build_line_fig(df, col, name, color, yaxis_title=None):
+    points = downsample(df[col])
+    fig = go.Figure(go.Scatter(
+        x=points.index, y=points, 
+        name=name, line=dict(color=color)
+    ))
+    if yaxis_title:
+        fig.update_layout(yaxis_title=yaxis_title)
+    return fig
+
+def build_credit_fig(df):
+    fig = go.Figure()
+    points = downsample(df['High_Yield_Bond'])
+    fig.add_trace(go.Scatter(
+        x=points.index, y=points, 
+        name='HYG (하이일드/위험)', line=dict(color='purple')
+    ))
+    if 'Inv_Grade_Bond' in df.columns:
+        points = downsample(df['Inv_Grade_Bond'])
+        fig.add_trace(go.Scatter(
+            x=points.index, y=points, 
+            name='LQD (투자등급/안전)', line=dict(color='cyan', dash='dash')
+        ))
+    fig.update_layout(
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
+def build_index_volume_fig(prices_df, volumes_df, col, name, line_color, bar_color):
+    fig = go.Figure()
+    points = downsample(prices_df[col])
+    fig.add_trace(go.Scatter(
+        x=points.index, y=points, 
+        name=name, line=dict(color=line_color)
+    ))
+    if col in volumes_df.columns:
+        fig.add_trace(go.Bar(
+            x=volumes_df.index, y=volumes_df[col], 
+            name='거래량', yaxis='y2', marker_color=bar_color
+        ))
+    fig.update_layout(
+        yaxis=dict(title=name),
+        yaxis2=dict(title='거래량', overlaying='y', side='right', showgrid=False),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
 
-# --- [v25] 메인 데이터 로드 및 병합 (2개 소스) ---
-with st.spinner("1. YFinance 데이터 로드 중..."):
-    df_yf_prices, df_yf_volumes = load_yfinance_data(YFINANCE_TICKERS, start_date="2010-01-01")
+# --- [v26] 세션별 Figure 메모이제이션 (LRU) ---
+# 같은 기간으로 다시 실행될 때(지표 선택, 사이드바 버튼 등) Figure를 다시 만들지 않습니다.
+FIG_CACHE_SIZE = 32
 
-with st.spinner("2. FRED 데이터 로드 중... (API 키 확인)"):
-    df_fred_prices = load_fred_data(FRED_TICKERS, start_date="2010-01-01") 
+def session_figure(name, start_date, end_date, builder, *args):
+    if 'fig_cache' not in st.session_state:
+        st.session_state['fig_cache'] = OrderedDict()
+    cache = st.session_state['fig_cache']
 
-# 데이터 병합 (YF + FRED)
-if df_yf_prices.empty and df_fred_prices.empty:
-    st.error("YFinance와 FRED 데이터를 모두 불러오지 못했습니다.")
-    st.stop()
-elif df_fred_prices.empty:
-    st.info("YFinance 데이터만 로드되었습니다.")
-    prices = df_yf_prices
-elif df_yf_prices.empty:
-    st.info("FRED 데이터만 로드되었습니다.")
-    prices = df_fred_prices
+    key = (name, start_date, end_date)
+    if key in cache:
+        cache.move_to_end(key)
+    else:
+        cache[key] = builder(*args)
+        while len(cache) > FIG_CACHE_SIZE:
+            cache.popitem(last=False)
+    return cache[key]
+
+# --- [v26] 병합된 데이터를 Parquet 스냅샷으로 저장 (재시작 시 빠른 로드) ---
+SNAPSHOT_DIR = ".cache"
+SNAPSHOT_TTL = 3600 # 초 단위, 로더 캐시(as_of 1시간 단위)와 같은 갱신 주기
+PRICES_PARQUET = os.path.join(SNAPSHOT_DIR, "prices.parquet")
+VOLUMES_PARQUET = os.path.join(SNAPSHOT_DIR, "volumes.parquet")
+
+def snapshot_saved_at():
+    # 저장된 지 SNAPSHOT_TTL 이내인 스냅샷의 저장 시각 (없거나 만료되었으면 None)
+    try:
+        saved_at = os.path.getmtime(PRICES_PARQUET)
+    except OSError:
+        return None
+    return saved_at if time.time() - saved_at <= SNAPSHOT_TTL else None
+
+@st.cache_data(max_entries=1)
+def read_parquet_snapshot(saved_at):
+    # 저장 시각(mtime)을 캐시 키로 사용 - 파일이 바뀌지 않는 한 rerun마다 다시 디코딩하지 않음
+    return pd.read_parquet(PRICES_PARQUET), pd.read_parquet(VOLUMES_PARQUET)
+
+def load_parquet_snapshot():
+    # 유효한 스냅샷이 있으면 (prices, volumes, saved_at), 없거나 읽을 수 없으면 None
+    saved_at = snapshot_saved_at()
+    if saved_at is None:
+        return None
+    try:
+        prices, volumes = read_parquet_snapshot(saved_at)
+    except (OSError, ValueError, ImportError):
+        return None
+    return prices, volumes, saved_at
+
+def save_parquet_snapshot(prices, volumes):
+    # 저장에 성공하면 스냅샷의 저장 시각(mtime), 실패하면 None
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        # volumes를 먼저 저장해야 prices의 수정 시각이 두 파일 모두 준비된 시점을 가리킴
+        volumes.to_parquet(VOLUMES_PARQUET, compression="zstd")
+        prices.to_parquet(PRICES_PARQUET, compression="zstd")
+        return os.path.getmtime(PRICES_PARQUET)
+    except (OSError, ValueError, ImportError) as e:
+        st.warning(f"Parquet 스냅샷 저장 실패 (다음 실행 시 API에서 다시 로드합니다): {e}")
+        return None
+
+def clear_parquet_snapshot():
+    for path in (PRICES_PARQUET, VOLUMES_PARQUET):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+# --- [v26] 데이터 로더 병렬 실행 (YFinance, FRED 동시 다운로드) ---
+def _fetch_all(as_of):
+    ctx = get_script_run_ctx()
+
+    def _run(loader, *args):
+        # 워커 스레드에서도 st.info/st.error 메시지가 현재 세션에 표시되도록 컨텍스트 연결
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return loader(*args)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as ex:
+        futures = {
+            ex.submit(_run, load_yfinance_data, YFINANCE_TICKERS, "2010-01-01", as_of): 'yf',
+            ex.submit(_run, load_fred_data, FRED_TICKERS, "2010-01-01", as_of): 'fred',
+        }
+        # 실패한 로더는 캐시되지 않으므로 다음 실행에서 다시 시도됨. 이번 실행은 빈 결과로 대체
+        fallbacks = {'yf': (pd.DataFrame(), pd.DataFrame()), 'fred': pd.DataFrame()}
+        results = {}
+        for future in concurrent.futures.as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except DataLoadError:
+                results[key] = fallbacks[key]
+
+    return results['yf'], results['fred']
+
+# --- [v25] 메인 데이터 로드 및 병합 (2개 소스) ---
+# [v26] 1시간 이내에 저장된 Parquet 스냅샷이 있으면 API 호출 없이 바로 사용
+snapshot = load_parquet_snapshot()
+
+if snapshot is not None:
+    prices, volumes, saved_at = snapshot
+    data_version = saved_at
 else:
-    st.info("YFinance와 FRED 데이터를 병합합니다.")
-    prices = pd.merge(df_yf_prices, df_fred_prices, left_index=True, right_index=True, how='outer')
+    as_of = datetime.now().strftime('%Y-%m-%d %H') # 1시간 단위 캐시 키
+    with st.spinner("데이터 로딩 중... (YFinance, FRED)"):
+        (df_yf_prices, df_yf_volumes), df_fred_prices = _fetch_all(as_of)
+
+    # 데이터 병합 (YF + FRED)
+    # --- [v26] 인덱스 기준 merge 대신 비어있지 않은 소스를 한 번에 concat ---
+    sources = {'YFinance': df_yf_prices, 'FRED': df_fred_prices}
+    loaded = {label: df for label, df in sources.items() if not df.empty}
+
+    if not loaded:
+        st.error("YFinance와 FRED 데이터를 모두 불러오지 못했습니다.")
+        st.stop()
+    elif len(loaded) == 1:
+        st.info(f"{next(iter(loaded))} 데이터만 로드되었습니다.")
+    else:
+        st.info("YFinance와 FRED 데이터를 병합합니다.")
+
+    prices = pd.concat(list(loaded.values()), axis=1, join='outer').sort_index()
+    # --- [v26] 끝 ---
 
-# 병합 후에는 주말/휴일 등으로 NaN이 발생하므로, ffill()로 채워줍니다.
-prices = prices.ffill()
-volumes = df_yf_volumes # 거래량은 YFinance에만 있음
+    # 병합 후에는 주말/휴일 등으로 NaN이 발생하므로 ffill()로 채워줍니다.
+    # [v26] 전체 기간 대신 기간 필터링 후 슬라이스에만 적용합니다 (slice_period 참고).
+    volumes = df_yf_volumes.sort_index() # 거래량은 YFinance에만 있음
 
-# --- [v14] NAN 리포트 (ffill 후에도 남은 NaN) ---
-nan_report = prices.isna().sum()
-nan_cols = nan_report[nan_report == len(prices)] 
+    # 일부 소스만 로드된 결과는 스냅샷으로 고정되지 않도록 저장하지 않음
+    saved_at = None
+    if len(loaded) == len(sources):
+        saved_at = save_parquet_snapshot(prices, volumes)
+
+    # [v26] 데이터 버전: 스냅샷을 저장했으면 그 저장 시각(다음 rerun의 스냅샷 경로와 동일),
+    # 저장하지 않았으면 내용 해시를 사용합니다.
+    if saved_at is not None:
+        data_version = saved_at
+    else:
+        data_version = (
+            int(pd.util.hash_pandas_object(prices).sum()),
+            int(pd.util.hash_pandas_object(volumes).sum()),
+        )
+
+# --- [v26] 새 데이터셋이 로드되면 세션 Figure 캐시를 비움 (session_figure 키에는 데이터가 없음) ---
+if st.session_state.get('fig_cache_version') != data_version:
+    st.session_state['fig_cache'] = OrderedDict()
+    st.session_state['fig_cache_version'] = data_version
+
+# --- [v14] NAN 리포트 (ffill 후에도 남은 NaN) ([v26] 캐시 적용) ---
+nan_cols = nan_report(prices, data_version)
 if not nan_cols.empty:
     st.warning("다음 티커는 전체 기간 데이터를 불러오지 못했습니다 (NaN):")
     st.dataframe(nan_cols)
 # --- [v14] 끝 ---
 
+# --- [v26] 종합 비교 차트 (fragment: 지표 선택을 바꿔도 이 영역만 다시 실행) ---
+@st.fragment
+def zscore_fragment(prices_filtered, data_version, start_ts, end_ts):
+    available_cols = list(prices_filtered.columns)
+
+    selected_cols = st.multiselect(
+        "비교할 지표를 선택하세요:",
+        options=available_cols,
+        default=available_cols 
+    )
+
+    if selected_cols:
+        df_to_normalize = prices_filtered[selected_cols].dropna(axis=1, how='all')
+
+        if df_to_normalize.empty:
+            st.warning("선택된 지표 중 유효한 데이터가 없습니다.")
+        else:
+            try:
+                # --- [v20] Z-Score 정규화 로직으로 변경 ([v26] 캐시 적용) ---
+                df_normalized = zscore(
+                    df_to_normalize, data_version, start_ts, end_ts, tuple(df_to_normalize.columns)
+                )
+                # --- [v20] 끝 ---
+
+                # [v26] 컬럼별 add_trace 루프 대신 wide-form 데이터로 한 번에 생성
+                # (WebGL은 트레이스가 많은 이 차트에만 사용 - 브라우저의 WebGL 컨텍스트 수 제한.
+                #  나머지 라인 차트는 SVG를 유지하고 downsample()로 포인트 수를 줄임)
+                fig_all = px.line(df_normalized, render_mode='webgl')
+
+                fig_all.add_hline(y=0, line_dash="dash", line_color="grey") # 0 = 평균선
+
+                fig_all.update_layout(
+                    xaxis_title=None,
+                    yaxis_title="Z-Score (표준편차)", # [v20] Y축 이름 변경
+                    legend_title_text=None,
+                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+                )
+
+                st.plotly_chart(fig_all, use_container_width=True)
+
+            except IndexError:
+                st.warning("선택된 기간이나 지표에 유효한 데이터가 없어 정규화 차트를 그릴 수 없습니다.")
+            except Exception as e:
+                st.error(f"종합 비교 차트 생성 중 오류 발생: {e}")
+
+    else:
+        st.info("비교할 지표를 1개 이상 선택해주세요.")
+
 # --- 차트 로직 ---
 if not prices.empty:
     
@@ -237,14 +611,11 @@ if not prices.empty:
     if start_date > end_date:
         st.error(f"시작일({start_date})이 종료일({end_date})보다 늦습니다. (데이터 로딩 오류)")
     else:
-        # --- (v10) .index.date와 date 객체를 직접 비교 ---
-        prices_filtered = prices[
-            (prices.index.date >= start_date) & (prices.index.date <= end_date)
-        ].dropna(how='all')
-        
-        volumes_filtered = volumes[
-            (volumes.index.date >= start_date) & (volumes.index.date <= end_date)
-        ].dropna(how='all')
+        # --- [v26] DatetimeIndex 슬라이싱 + 캐시 (v10의 .index.date 비교 대체) ---
+        start_ts = pd.Timestamp(start_date)
+        end_ts = pd.Timestamp(end_date)
+        prices_filtered = slice_period(prices, data_version, 'prices', start_ts, end_ts, ffill=True)
+        volumes_filtered = slice_period(volumes, data_version, 'volumes', start_ts, end_ts)
 
         if prices_filtered.empty:
             st.warning("선택하신 기간에 데이터가 없습니다. 기간을 다시 설정해주세요.")
@@ -256,52 +627,9 @@ if not prices.empty:
             with col1:
                 st.header("🇺🇸 미국 금리 지표")
                 
-                # 1-1. 국채 금리
+                # 1-1. 국채 금리 + 1-2. 장단기 금리차 ([v26] 하나의 Figure로 통합)
                 st.subheader("정책금리 및 국채 금리 (Yield)")
-                fig_yield = go.Figure()
-                
-                if 'Fed_Funds' in prices_filtered.columns:
-                    fig_yield.add_trace(go.Scatter(
-                        x=prices_filtered.index, y=prices_filtered['Fed_Funds'], 
-                        name='연준 실효 금리 (DFF)', line=dict(color='red', dash='dot')
-                    ))
-                # --- [v22] SOFR 차트 추가 ---
-                if 'SOFR' in prices_filtered.columns:
-                    fig_yield.add_trace(go.Scatter(
-                        x=prices_filtered.index, y=prices_filtered['SOFR'], 
-                        name='SOFR (단기 기준금리)', line=dict(color='green', dash='dot')
-                    ))
-                # --- [v22] 끝 ---
-                if 'US_10Y_Yield' in prices_filtered.columns:
-                    fig_yield.add_trace(go.Scatter(
-                        x=prices_filtered.index, y=prices_filtered['US_10Y_Yield'], 
-                        name='미 10년물 금리 (%)', line=dict(color='blue')
-                    ))
-                if 'US_3M_Yield' in prices_filtered.columns:
-                    fig_yield.add_trace(go.Scatter(
-                        x=prices_filtered.index, y=prices_filtered['US_3M_Yield'], 
-                        name='미 3개월물 금리 (%)', line=dict(color='orange')
-                    ))
-                
-                fig_yield.update_layout(
-                    yaxis_title="금리 (%)",
-                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-                )
-                st.plotly_chart(fig_yield, use_container_width=True)
-
-                # 1-2. 장단기 금리차 (10Y - 3M)
-                st.subheader("장단기 금리차 (10Y - 3M)")
-                if 'US_10Y_Yield' in prices_filtered.columns and 'US_3M_Yield' in prices_filtered.columns:
-                    spread_df = prices_filtered[['US_10Y_Yield', 'US_3M_Yield']].dropna()
-                    yield_spread = spread_df['US_10Y_Yield'] - spread_df['US_3M_Yield']
-                    
-                    if not yield_spread.empty:
-                        fig_spread = go.Figure(go.Scatter(
-                            x=yield_spread.index, y=yield_spread, 
-                            name='10Y-3M Spread', line=dict(color='red'), fill='tozeroy'
-                        ))
-                        fig_spread.add_hline(y=0, line_dash="dash", line_color="grey")
-                        st.plotly_chart(fig_spread, use_container_width=True)
+                st.plotly_chart(build_yield_fig(prices_filtered, data_version, start_ts, end_ts), use_container_width=True)
 
             with col2:
                 st.header("🇺🇸 신용 & 인플레이션 기대")
@@ -309,29 +637,16 @@ if not prices.empty:
                 # 1-3. 신용 채권
                 st.subheader("신용 채권 (Credit Bonds)")
                 if 'High_Yield_Bond' in prices_filtered.columns:
-                    fig_credit = go.Figure()
-                    fig_credit.add_trace(go.Scatter(
-                        x=prices_filtered.index, y=prices_filtered['High_Yield_Bond'], 
-                        name='HYG (하이일드/위험)', line=dict(color='purple')
-                    ))
-                    if 'Inv_Grade_Bond' in prices_filtered.columns:
-                        fig_credit.add_trace(go.Scatter(
-                            x=prices_filtered.index, y=prices_filtered['Inv_Grade_Bond'], 
-                            name='LQD (투자등급/안전)', line=dict(color='cyan', dash='dash')
-                        ))
-                    fig_credit.update_layout(
-                        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-                    )
+                    fig_credit = session_figure('credit', start_date, end_date, build_credit_fig, prices_filtered)
                     st.plotly_chart(fig_credit, use_container_width=True)
 
                 # 1-4. 10년 기대 인플레이션 (Daily FRED)
                 st.subheader("10년 기대 인플레이션 (Breakeven)")
                 if '10Y_Breakeven' in prices_filtered.columns:
-                    fig_breakeven = go.Figure(go.Scatter(
-                        x=prices_filtered.index, y=prices_filtered['10Y_Breakeven'],
-                        name='10Y Breakeven (%)', line=dict(color='orange')
-                    ))
-                    fig_breakeven.update_layout(yaxis_title="기대 인플레이션 (%)")
+                    fig_breakeven = session_figure(
+                        'breakeven', start_date, end_date, build_line_fig, prices_filtered,
+                        '10Y_Breakeven', '10Y Breakeven (%)', 'orange', "기대 인플레이션 (%)"
+                    )
                     st.plotly_chart(fig_breakeven, use_container_width=True)
 
             st.divider()
@@ -343,35 +658,35 @@ if not prices.empty:
             with col3:
                 st.subheader("WTI 유가 (Crude Oil)")
                 if 'Crude_Oil' in prices_filtered.columns:
-                    fig_oil = go.Figure(go.Scatter(
-                        x=prices_filtered.index, y=prices_filtered['Crude_Oil'], 
-                        name='WTI Crude Oil ($)', line=dict(color='green')
-                    ))
+                    fig_oil = session_figure(
+                        'oil', start_date, end_date, build_line_fig, prices_filtered,
+                        'Crude_Oil', 'WTI Crude Oil ($)', 'green'
+                    )
                     st.plotly_chart(fig_oil, use_container_width=True)
 
                 st.subheader("구리 (Dr. Copper)")
                 if 'Copper' in prices_filtered.columns:
-                    fig_copper = go.Figure(go.Scatter(
-                        x=prices_filtered.index, y=prices_filtered['Copper'], 
-                        name='Copper ($)', line=dict(color='brown')
-                    ))
+                    fig_copper = session_figure(
+                        'copper', start_date, end_date, build_line_fig, prices_filtered,
+                        'Copper', 'Copper ($)', 'brown'
+                    )
                     st.plotly_chart(fig_copper, use_container_width=True)
             
             with col4:
                 st.subheader("금 (Gold)")
                 if 'Gold' in prices_filtered.columns:
-                    fig_gold = go.Figure(go.Scatter(
-                        x=prices_filtered.index, y=prices_filtered['Gold'], 
-                        name='Gold ($)', line=dict(color='gold')
-                    ))
+                    fig_gold = session_figure(
+                        'gold', start_date, end_date, build_line_fig, prices_filtered,
+                        'Gold', 'Gold ($)', 'gold'
+                    )
                     st.plotly_chart(fig_gold, use_container_width=True)
 
                 st.subheader("물가연동채 ETF (TIPS)")
                 if 'TIPS_ETF' in prices_filtered.columns:
-                    fig_tips = go.Figure(go.Scatter(
-                        x=prices_filtered.index, y=prices_filtered['TIPS_ETF'], 
-                        name='TIPS ETF Price ($)', line=dict(color='teal')
-                    ))
+                    fig_tips = session_figure(
+                        'tips', start_date, end_date, build_line_fig, prices_filtered,
+                        'TIPS_ETF', 'TIPS ETF Price ($)', 'teal'
+                    )
                     st.plotly_chart(fig_tips, use_container_width=True)
             
             st.divider()
@@ -383,40 +698,18 @@ if not prices.empty:
             with col5:
                 st.subheader("KOSPI 지수 및 거래량")
                 if 'KOSPI' in prices_filtered.columns:
-                    fig_kospi = go.Figure()
-                    fig_kospi.add_trace(go.Scatter(
-                        x=prices_filtered.index, y=prices_filtered['KOSPI'], 
-                        name='KOSPI 지수', line=dict(color='blue')
-                    ))
-                    if 'KOSPI' in volumes.columns:
-                        fig_kospi.add_trace(go.Bar(
-                            x=volumes_filtered.index, y=volumes_filtered['KOSPI'], 
-                            name='거래량', yaxis='y2', marker_color='lightblue'
-                        ))
-                    fig_kospi.update_layout(
-                        yaxis=dict(title='KOSPI 지수'),
-                        yaxis2=dict(title='거래량', overlaying='y', side='right', showgrid=False),
-                        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+                    fig_kospi = session_figure(
+                        'kospi', start_date, end_date, build_index_volume_fig, prices_filtered, volumes_filtered,
+                        'KOSPI', 'KOSPI 지수', 'blue', 'lightblue'
                     )
                     st.plotly_chart(fig_kospi, use_container_width=True)
                 
             with col6:
                 st.subheader("KOSDAQ 지수 및 거래량")
                 if 'KOSDAQ' in prices_filtered.columns:
-                    fig_kosdaq = go.Figure()
-                    fig_kosdaq.add_trace(go.Scatter(
-                        x=prices_filtered.index, y=prices_filtered['KOSDAQ'], 
-                        name='KOSDAQ 지수', line=dict(color='red')
-                    ))
-                    if 'KOSDAQ' in volumes.columns:
-                        fig_kosdaq.add_trace(go.Bar(
-                            x=volumes_filtered.index, y=volumes_filtered['KOSDAQ'], 
-                            name='거래량', yaxis='y2', marker_color='pink'
-                        ))
-                    fig_kosdaq.update_layout(
-                        yaxis=dict(title='KOSDAQ 지수'),
-                        yaxis2=dict(title='거래량', overlaying='y', side='right', showgrid=False),
-                        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+                    fig_kosdaq = session_figure(
+                        'kosdaq', start_date, end_date, build_index_volume_fig, prices_filtered, volumes_filtered,
+                        'KOSDAQ', 'KOSDAQ 지수', 'red', 'pink'
                     )
                     st.plotly_chart(fig_kosdaq, use_container_width=True)
                 
@@ -429,19 +722,19 @@ if not prices.empty:
             with col7:
                 st.subheader("반도체 ETF (Hardware)")
                 if 'Semiconductor_ETF' in prices_filtered.columns:
-                    fig_smh = go.Figure(go.Scatter(
-                        x=prices_filtered.index, y=prices_filtered['Semiconductor_ETF'], 
-                        name='SMH ($)', line=dict(color='cyan')
-                    ))
+                    fig_smh = session_figure(
+                        'smh', start_date, end_date, build_line_fig, prices_filtered,
+                        'Semiconductor_ETF', 'SMH ($)', 'cyan'
+                    )
                     st.plotly_chart(fig_smh, use_container_width=True)
 
             with col8:
                 st.subheader("클라우드 ETF (Platform)")
                 if 'Cloud_ETF' in prices_filtered.columns:
-                    fig_skyy = go.Figure(go.Scatter(
-                        x=prices_filtered.index, y=prices_filtered['Cloud_ETF'], 
-                        name='SKYY ($)', line=dict(color='magenta')
-                    ))
+                    fig_skyy = session_figure(
+                        'skyy', start_date, end_date, build_line_fig, prices_filtered,
+                        'Cloud_ETF', 'SKYY ($)', 'magenta'
+                    )
                     st.plotly_chart(fig_skyy, use_container_width=True)
             # --- [v19] 끝 ---
 
@@ -452,51 +745,7 @@ if not prices.empty:
             st.info("선택된 기간의 평균(μ)을 0, 표준편차(σ)를 1로 표준화하여 각 지표의 상대적 위치(과열/침체)를 비교합니다.")
             # --- [v20] 끝 ---
 
-            available_cols = list(prices_filtered.columns)
-            
-            selected_cols = st.multiselect(
-                "비교할 지표를 선택하세요:",
-                options=available_cols,
-                default=available_cols 
-            )
-
-            if selected_cols:
-                df_to_normalize = prices_filtered[selected_cols].dropna(axis=1, how='all')
-                
-                if df_to_normalize.empty:
-                    st.warning("선택된 지표 중 유효한 데이터가 없습니다.")
-                else:
-                    try:
-                        # --- [v20] Z-Score 정규화 로직으로 변경 ---
-                        df_mean = df_to_normalize.mean()
-                        df_std = df_to_normalize.std()
-                        df_normalized = (df_to_normalize - df_mean) / df_std
-                        # --- [v20] 끝 ---
-                        
-                        fig_all = go.Figure()
-                        for col in df_normalized.columns:
-                            fig_all.add_trace(go.Scatter(
-                                x=df_normalized.index, 
-                                y=df_normalized[col], 
-                                name=col
-                            ))
-                        
-                        fig_all.add_hline(y=0, line_dash="dash", line_color="grey") # 0 = 평균선
-                        
-                        fig_all.update_layout(
-                            yaxis_title="Z-Score (표준편차)", # [v20] Y축 이름 변경
-                            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-                        )
-                        
-                        st.plotly_chart(fig_all, use_container_width=True)
-
-                    except IndexError:
-                        st.warning("선택된 기간이나 지표에 유효한 데이터가 없어 정규화 차트를 그릴 수 없습니다.")
-                    except Exception as e:
-                        st.error(f"종합 비교 차트 생성 중 오류 발생: {e}")
-            
-            else:
-                st.info("비교할 지표를 1개 이상 선택해주세요.")
+            zscore_fragment(prices_filtered, data_version, start_ts, end_ts)
 
             st.subheader("데이터 원본 (선택된 기간)")
             st.dataframe(prices_filtered.tail(10))
@@ -526,5 +775,8 @@ st.sidebar.code("streamlit run dashboard.py")
 st.sidebar.header("문제 해결")
 if st.sidebar.button("데이터 캐시 지우기"):
     st.cache_data.clear()
+    _get_fred_client.clear() # [v26] API 키 변경 시 FRED 클라이언트도 다시 생성
+    st.session_state.pop('fig_cache', None) # [v26] 세션 Figure 캐시도 비움
+    clear_parquet_snapshot() # [v26] Parquet 스냅샷도 삭제
     st.info("데이터 캐시를 지웠습니다. 앱을 새로고침합니다.")
     st.rerun()